@@ -1,13 +1,14 @@
+import functools
 import os
 import questionary
 import pyperclip
 from rich.console import Console
 from src.utils import load_config, save_path_to_config, setup_logging, save_data_to_file
 from src.template_loader import load_templates
-from src.core import fetch_repo_data
 
-# ✅ Import BOTH functions from your robust engine
-from src.engine import run_template_workflow, run_llm_execution 
+# NOTE: src.core and src.engine are imported lazily inside the handlers.
+# They pull in GitPython, tiktoken and the LLM SDKs, which would otherwise
+# delay startup even when the user only wants the menu.
 
 # Initialize Logger & Console
 logger = setup_logging()
@@ -15,6 +16,50 @@ console = Console()
 
 OUTPUT_ROOT_DIR = "Extracted JSON"
 
+# Main menu labels, importable by tests so assertions never drift from
+# what the menu actually renders.
+MENU_DIRECT = "🚀 Execute AI Prompt (Direct Mode)"
+MENU_RAW = "💾 Extract Raw Data (Classic Mode)"
+MENU_EXIT = "❌ Exit"
+
+# Fixed menus, built once at import time (the interactive loop re-shows
+# them many times). Stored as tuples; callers pass a fresh list copy.
+_PROVIDER_CHOICES = (
+    questionary.Choice("🛡️  Ollama (Local - Safe, Private, Free)", value="ollama"),
+    questionary.Choice("☁️  OpenAI (Cloud - Public, Costs Tokens)", value="openai"),
+    questionary.Choice("☁️  XAI / Grok (Cloud - Public, Costs Tokens)", value="xai"),
+    questionary.Choice("☁️  Gemini (Cloud - Public, Costs Tokens)", value="gemini"),
+    questionary.Separator(),
+    questionary.Choice("🔙 Back", value=None)
+)
+
+_RAW_MODE_CHOICES = (
+    questionary.Choice("📝 Staged Changes (Pre-Commit Analysis)", value=("staged", "Staged_Changes")),
+    questionary.Choice("📜 All History", value=("all", "All_History")),
+    questionary.Choice("🔢 Last N Commits", value=("limit", "Last_N_Commits")),
+    questionary.Choice("📅 Date Range", value=("date", "Date_Range")),
+    questionary.Choice("👤 By Author", value=("author", "By_Author"))
+)
+
+_PROMPT_HANDLING_CHOICES = (
+    questionary.Choice("📋 Copy to Clipboard", value="clipboard"),
+    questionary.Choice("💾 Save to File", value="file"),
+    questionary.Separator(),
+    questionary.Choice("🚀 Execute with AI Agent", value="execute"),
+    questionary.Separator(),
+    questionary.Choice("❌ Cancel", value="cancel")
+)
+
+@functools.lru_cache(maxsize=1)
+def _cwd():
+    """os.getcwd() is a syscall; the tool never changes directory mid-run."""
+    return os.getcwd()
+
+@functools.lru_cache(maxsize=128)
+def resolve_output_path(filename, subfolder):
+    """Resolves an output file path under OUTPUT_ROOT_DIR (cached per pair)."""
+    return os.path.join(_cwd(), OUTPUT_ROOT_DIR, subfolder, filename)
+
 def get_repository_path():
     """Interactively asks user to select or input a repo path."""
     config = load_config()
@@ -36,7 +81,7 @@ def get_repository_path():
         ).ask()
         if selected_path:
             selected_path = selected_path.strip('"\'')
-            save_path_to_config(selected_path)
+            save_path_to_config(selected_path, config=config)
             
     return selected_path
 
@@ -45,27 +90,13 @@ def select_llm_provider():
     Specific menu for choosing an AI provider.
     Now supports all 4 providers defined in src/providers.py
     """
-    choice = questionary.select(
+    # Each Choice carries the internal ID used by providers.py, so the
+    # answer needs no label parsing ("Back" and cancel both yield None).
+    return questionary.select(
         "Select your Intelligence Provider:",
-        choices=[
-            "🛡️  Ollama (Local - Safe, Private, Free)",
-            "☁️  OpenAI (Cloud - Public, Costs Tokens)",
-            "☁️  XAI / Grok (Cloud - Public, Costs Tokens)",
-            "☁️  Gemini (Cloud - Public, Costs Tokens)",
-            questionary.Separator(),
-            "🔙 Back"
-        ]
+        choices=list(_PROVIDER_CHOICES)
     ).ask()
 
-    # Map display label to internal ID used by providers.py
-    if choice is None: return None
-    if "Ollama" in choice: return "ollama"
-    if "OpenAI" in choice: return "openai"
-    if "XAI" in choice:    return "xai"
-    if "Gemini" in choice: return "gemini"
-    
-    return None
-
 def get_user_prompt():
     return questionary.text("Enter your prompt for the AI:").ask()
 
@@ -73,43 +104,34 @@ def run_raw_extraction_mode(repo_path):
     """
     Restores the classic 'Extract to JSON' functionality.
     """
-    # Menu Options
-    OPT_STAGED = "📝 Staged Changes (Pre-Commit Analysis)"
-    OPT_ALL = "📜 All History"
-    OPT_LIMIT = "🔢 Last N Commits"
-    OPT_DATE = "📅 Date Range"
-    OPT_AUTHOR = "👤 By Author"
-
+    # Each Choice value is (mode key, output sub-directory), so no label
+    # parsing or separate directory mapping is needed afterwards.
     mode_selection = questionary.select(
         "Raw Data Extraction: What filters?",
-        choices=[OPT_STAGED, OPT_ALL, OPT_LIMIT, OPT_DATE, OPT_AUTHOR]
+        choices=list(_RAW_MODE_CHOICES)
     ).ask()
+    if mode_selection is None:
+        return
 
-    # Directory Mapping
-    dir_mapping = {
-        OPT_STAGED: "Staged_Changes",
-        OPT_ALL: "All_History",
-        OPT_LIMIT: "Last_N_Commits",
-        OPT_DATE: "Date_Range",
-        OPT_AUTHOR: "By_Author"
-    }
-    selected_sub_dir = dir_mapping.get(mode_selection, "Other")
+    mode_key, selected_sub_dir = mode_selection
 
     # Filter Logic
     filters = {}
-    if mode_selection == OPT_STAGED:
+    if mode_key == "staged":
         filters['mode'] = 'staged'
-    elif mode_selection == OPT_LIMIT:
+    elif mode_key == "limit":
         filters['limit'] = questionary.text("How many commits?", validate=lambda t: t.isdigit()).ask()
-    elif mode_selection == OPT_DATE:
+    elif mode_key == "date":
         filters['since'] = questionary.text("Start Date (YYYY-MM-DD):").ask()
         filters['until'] = questionary.text("End Date (YYYY-MM-DD) [Optional]:").ask()
         if filters['until'] == "": filters['until'] = None
-    elif mode_selection == OPT_AUTHOR:
+    elif mode_key == "author":
         filters['author'] = questionary.text("Author Name:").ask()
 
     # Execution
     try:
+        from src.core import fetch_repo_data
+
         console.print("   ⚙️  Extracting data...")
         data = fetch_repo_data(repo_path, filters)
         
@@ -120,8 +142,7 @@ def run_raw_extraction_mode(repo_path):
 
         # Output Handling
         filename = questionary.text("Output JSON filename:", default="raw_data.json").ask()
-        target_dir = os.path.join(os.getcwd(), OUTPUT_ROOT_DIR, selected_sub_dir)
-        full_output_path = os.path.join(target_dir, filename)
+        full_output_path = resolve_output_path(filename, selected_sub_dir)
 
         if questionary.confirm(f"Save {count} items to:\n   📂 {full_output_path}").ask():
             success = save_data_to_file(data, full_output_path)
@@ -136,6 +157,20 @@ def run_raw_extraction_mode(repo_path):
         console.print(f"\n❌ Error: {e}", style="bold red")
         logger.error("Raw extraction failed", exc_info=True)
 
+@functools.lru_cache(maxsize=4)
+def _compose_main_menu(template_names):
+    """Composes the main menu for a given tuple of template names (cached)."""
+    choices = []
+
+    if template_names:
+        choices.extend(template_names)
+        choices.append(questionary.Separator())
+
+    choices.append(MENU_DIRECT)
+    choices.append(MENU_RAW)
+    choices.append(MENU_EXIT)
+    return tuple(choices)
+
 def run_app():
     """Main Application Loop"""
     console.print("\n--- 🤖 Git-to-JSON Framework (v2.5) ---\n", style="bold blue")
@@ -146,49 +181,45 @@ def run_app():
     logger.info(f"Session started for: {repo_path}")
     console.print(f"Selected Repo: [green]{repo_path}[/green]")
 
-    # 1. Load Templates
-    templates = load_templates()
-    
-    # 2. Build Menu Choices
-    choices = []
-    
-    if templates:
-        choices.extend([t["meta"]["name"] for t in templates])
-        choices.append(questionary.Separator()) 
-    
-    choices.append("🚀 Execute AI Prompt (Direct Mode)")
-    choices.append("💾 Extract Raw Data (Classic Mode)")
-    choices.append("❌ Exit")
-
     while True:
+        # Both calls are cached: load_templates per directory mtime, the
+        # composed menu per name tuple. A fresh list copy goes to questionary.
+        templates = load_templates()
+        templates_by_name = {t["meta"]["name"]: t for t in templates}
+        choices = list(_compose_main_menu(tuple(templates_by_name)))
+
         selection_name = questionary.select(
             "What is your goal?",
             choices=choices
         ).ask()
 
         # --- BRANCH: EXIT ---
-        if selection_name == "❌ Exit":
+        if selection_name == MENU_EXIT:
             console.print("Goodbye!", style="bold blue") # FIXED: Bug #5 (Consistent Exit)
             break
             
         # --- BRANCH: RAW DATA ---
-        elif selection_name == "💾 Extract Raw Data (Classic Mode)":
+        elif selection_name == MENU_RAW:
             run_raw_extraction_mode(repo_path)
 
         # --- BRANCH: DIRECT EXECUTION ---
-        elif selection_name == "🚀 Execute AI Prompt (Direct Mode)":
+        elif selection_name == MENU_DIRECT:
             provider = select_llm_provider()
             if provider:
                 prompt = get_user_prompt()
                 if prompt:
+                    from src.engine import run_llm_execution
+
                     # Call engine's async runner (Blocking call)
                     run_llm_execution(provider, prompt)
             
         # --- BRANCH: TEMPLATE WORKFLOW ---
         else:
-            # It's a template
-            selected_template = next(t for t in templates if t["meta"]["name"] == selection_name)
-            
+            # It's a template (O(1) hash lookup instead of a linear scan)
+            selected_template = templates_by_name[selection_name]
+
+            from src.engine import run_template_workflow
+
             # 1. Run Engine to get Text (No auto-copy)
             prompt = run_template_workflow(repo_path, selected_template)
             
@@ -196,14 +227,7 @@ def run_app():
                 # 2. Show Output Menu
                 output_option = questionary.select(
                     "How do you want to handle this prompt?",
-                    choices=[
-                        questionary.Choice("📋 Copy to Clipboard", value="clipboard"),
-                        questionary.Choice("💾 Save to File", value="file"),
-                        questionary.Separator(), 
-                        questionary.Choice("🚀 Execute with AI Agent", value="execute"),
-                        questionary.Separator(),
-                        questionary.Choice("❌ Cancel", value="cancel")
-                    ]
+                    choices=list(_PROMPT_HANDLING_CHOICES)
                 ).ask()
 
                 # FIXED: Bug #4 (UX - Cancel should loop back immediately)
@@ -236,6 +260,8 @@ def run_app():
                     # We must ask for the provider now
                     provider = select_llm_provider()
                     if provider:
+                        from src.engine import run_llm_execution
+
                         console.print("\n🤖 [Agent] Initializing AI Execution...", style="bold purple")
                         # Pass the generated prompt to the engine
                         run_llm_execution(provider, prompt)
@@ -1,3 +1,4 @@
+import functools
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import ValidationError
@@ -18,7 +19,10 @@ class LLMSettings(BaseSettings):
     # We tell Pydantic to look for a .env file
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+@functools.lru_cache(maxsize=1)
 def load_settings():
+    # Cached: the .env/environment scan only runs once per session.
+    # Call load_settings.cache_clear() if the .env file changes mid-run.
     try:
         return LLMSettings()
     except ValidationError as e:
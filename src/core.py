@@ -102,18 +102,21 @@ def fetch_repo_data(repo_path, filters):
             if filters.get('author'): kwargs['author'] = filters['author']
 
             logger.info(f"Fetching History with filters: {kwargs}")
-            commits_generator = list(repo.iter_commits(**kwargs))
-            
-            for commit in commits_generator:
-                commit_info = {
-                    "hash": commit.hexsha,
-                    "short_hash": commit.hexsha[:7],
+
+            # Iterate the commit generator directly (no upfront list()) and
+            # bind hot names locally so the per-commit loop stays tight.
+            append = commits_data.append
+            from_timestamp = datetime.fromtimestamp
+            for commit in repo.iter_commits(**kwargs):
+                hexsha = commit.hexsha
+                append({
+                    "hash": hexsha,
+                    "short_hash": hexsha[:7],
                     "author": commit.author.name,
-                    "date": datetime.fromtimestamp(commit.committed_date),
+                    "date": from_timestamp(commit.committed_date),
                     "message": commit.message.strip(),
                     "diff": get_commit_diff(commit)
-                }
-                commits_data.append(commit_info)
+                })
 
         return commits_data
 
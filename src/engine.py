@@ -1,3 +1,4 @@
+import atexit
 import logging
 import asyncio
 from datetime import datetime
@@ -17,6 +18,20 @@ console = Console()
 # Constants
 OUTPUT_ROOT_DIR = "Extracted JSON"
 
+# One long-lived loop for all AI executions. asyncio.run would close its
+# loop after each prompt, orphaning the keep-alive transports inside the
+# cached provider clients' HTTP pools. (Plain new_event_loop rather than
+# asyncio.Runner: the latter is 3.11+ and we support 3.10.)
+_loop = None
+
+def _get_loop():
+    """Returns the process-wide event loop, creating it on first use."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        atexit.register(_loop.close)
+    return _loop
+
 def run_template_workflow(repo_path, template):
     """
     Orchestrates the Flow: Data Fetch -> Prompt Build
@@ -87,8 +102,8 @@ def run_llm_execution(provider_name, user_prompt):
                     live.update(Markdown(full_response))
             return full_response
 
-        # 4. Run the async loop
-        return asyncio.run(stream_task())
+        # 4. Run on the shared loop (kept alive across executions)
+        return _get_loop().run_until_complete(stream_task())
 
     except ValueError as e:
         console.print(f"\n[bold red]Configuration Error:[/]\n{e}")
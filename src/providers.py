@@ -76,21 +76,36 @@ class OllamaProvider(LLMProvider):
             if chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
 
+# Providers built this session, keyed by the settings that shape them.
+# Reusing the instance keeps the SDK's HTTP client (connection pool, TLS
+# session) alive across executions instead of re-handshaking per prompt.
+_provider_cache = {}
+
+def clear_provider_cache():
+    """Drops cached provider instances (used by tests and key changes)."""
+    _provider_cache.clear()
+
 # --- The Factory ---
 def get_provider(choice: str, settings: LLMSettings) -> LLMProvider:
     if choice == "openai":
         if not settings.openai_api_key: raise ValueError("Missing OPENAI_API_KEY in .env")
-        return OpenAIProvider(settings.openai_api_key)
-    
+        key, build = (choice, settings.openai_api_key), lambda: OpenAIProvider(settings.openai_api_key)
+
     elif choice == "xai":
         if not settings.xai_api_key: raise ValueError("Missing XAI_API_KEY in .env")
-        return XAIProvider(settings.xai_api_key)
-    
+        key, build = (choice, settings.xai_api_key), lambda: XAIProvider(settings.xai_api_key)
+
     elif choice == "gemini":
         if not settings.gemini_api_key: raise ValueError("Missing GEMINI_API_KEY in .env")
-        return GeminiProvider(settings.gemini_api_key)
-    
+        key, build = (choice, settings.gemini_api_key), lambda: GeminiProvider(settings.gemini_api_key)
+
     elif choice == "ollama":
-        return OllamaProvider(settings.ollama_base_url, settings.ollama_model)
-    
-    raise ValueError(f"Unknown provider: {choice}")
\ No newline at end of file
+        key = (choice, settings.ollama_base_url, settings.ollama_model)
+        build = lambda: OllamaProvider(settings.ollama_base_url, settings.ollama_model)
+
+    else:
+        raise ValueError(f"Unknown provider: {choice}")
+
+    if key not in _provider_cache:
+        _provider_cache[key] = build()
+    return _provider_cache[key]
\ No newline at end of file
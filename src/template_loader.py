@@ -1,51 +1,84 @@
 import os
-import json
 import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 # Constants
 TEMPLATE_DIR = "templates"
+REQUIRED_KEYS = frozenset({"meta", "execution", "prompts"})
+
+# In-process cache: (directory mtime_ns, parsed templates)
+_template_cache = None
+
+def clear_template_cache():
+    """Drops the cached template list (used by tests and config reloads)."""
+    global _template_cache
+    _template_cache = None
+
+def _read_file(path):
+    """Single-pass raw read of one template file (runs in worker threads)."""
+    with open(path, 'rb') as f:
+        return f.read()
 
 def load_templates():
     """
     Scans the 'templates/' directory and returns a list of valid template objects.
+    Results are cached per directory mtime, so repeated menu refreshes are free.
     """
+    global _template_cache
     templates = []
-    
+
     # Ensure dir exists
     if not os.path.exists(TEMPLATE_DIR):
         logger.warning(f"Template directory '{TEMPLATE_DIR}' not found. Creating it.")
         os.makedirs(TEMPLATE_DIR)
         return []
 
-    for filename in os.listdir(TEMPLATE_DIR):
-        if filename.endswith(".json"):
-            file_path = os.path.join(TEMPLATE_DIR, filename)
+    dir_mtime = os.stat(TEMPLATE_DIR).st_mtime_ns
+    if _template_cache is not None and _template_cache[0] == dir_mtime:
+        return _template_cache[1]
+
+    # os.scandir avoids the extra stat + path-join work of os.listdir
+    jobs = []
+    with os.scandir(TEMPLATE_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file(follow_symlinks=False):
+                continue
+            jobs.append((entry.name, entry.path))
+
+    if jobs:
+        # Fan out the reads across threads (I/O bound), then decode and
+        # validate on the main thread in a stable order.
+        with ThreadPoolExecutor(max_workers=min(32, len(jobs))) as pool:
+            futures = [(name, pool.submit(_read_file, path)) for name, path in jobs]
+
+        for filename, future in futures:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
+                data = orjson.loads(future.result())
+
                 if validate_schema(data, filename):
                     # Inject filename for internal reference
-                    data['_filename'] = filename 
+                    data['_filename'] = filename
                     templates.append(data)
-            
+
             except Exception as e:
                 logger.error(f"Failed to load template {filename}: {e}")
 
+    _template_cache = (dir_mtime, templates)
     return templates
 
 def validate_schema(data, filename):
     """
     Ensures the JSON has the 3 required blocks: meta, execution, prompts.
     """
-    required_keys = ["meta", "execution", "prompts"]
-    for key in required_keys:
-        if key not in data:
-            logger.warning(f"Skipping {filename}: Missing '{key}' block.")
-            return False
-            
+    # One C-level set difference instead of per-key membership probes
+    missing = REQUIRED_KEYS.difference(data)
+    if missing:
+        logger.warning(f"Skipping {filename}: Missing {sorted(missing)} block(s).")
+        return False
+
     # Check sub-keys (Basic validation)
     if "name" not in data["meta"]:
         logger.warning(f"Skipping {filename}: Meta block missing 'name'.")
@@ -1,63 +1,151 @@
+import atexit
+import functools
 import json
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import orjson
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
-import tiktoken
 
 # Constants
 CONFIG_FILE = "repo_config.json"
 LOG_FILE = "git_extraction.log"
 
+# tiktoken loads its BPE tables at import time (tens of ms and several MB),
+# so it is deferred to the first token count. Kept as a module attribute so
+# tests can still patch src.utils.tiktoken.
+tiktoken = None
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model):
+    """Resolves and caches the tiktoken encoding for a model name."""
+    global tiktoken
+    if tiktoken is None:
+        import tiktoken
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model names fall back to the GPT-4 family encoding
+        return tiktoken.get_encoding("cl100k_base")
+
 def count_tokens(text, model="gpt-4"):
     """
     Returns the number of tokens in a text string using tiktoken.
     Defaults to gpt-4 encoding (cl100k_base).
     """
     try:
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(text))
+        return len(_get_encoding(model).encode(text))
     except Exception as e:
         # Fallback if model is unknown or tiktoken fails
         logging.getLogger(__name__).warning(f"Token count failed: {e}. using char estimate.")
         return len(text) // 4  # Rough estimate
 
+def count_tokens_batch(texts, model="gpt-4"):
+    """
+    Returns token counts for a list of strings in one tiktoken call.
+    encode_batch drives tiktoken's internal thread pool, which is much
+    faster than looping count_tokens over many commit diffs.
+    """
+    # Materialize once: the fallback below iterates texts too, and a
+    # generator argument would already be exhausted by encode_batch.
+    texts = list(texts)
+    try:
+        encoding = _get_encoding(model)
+        num_threads = min(8, os.cpu_count() or 1)
+        return [len(tokens) for tokens in encoding.encode_batch(texts, num_threads=num_threads)]
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Batch token count failed: {e}. using char estimate.")
+        return [len(text) // 4 for text in texts]
+
+# Background listener that drains log records to disk off the hot path
+_log_listener = None
+
 def setup_logging():
-    """Configures application-wide logging with rotation and UTF-8 support."""
-    log_handler = RotatingFileHandler(
-        LOG_FILE, 
-        maxBytes=5*1024*1024,  # 5 MB
-        backupCount=1, 
-        encoding='utf-8'
-    )
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[log_handler]
-    )
+    """
+    Configures application-wide logging with rotation and UTF-8 support.
+    Records pass through an in-memory queue so callers never block on the
+    file write; a background listener thread owns the rotating handler.
+    Idempotent: repeat calls reuse the running listener.
+    """
+    global _log_listener
+    if _log_listener is None:
+        file_handler = RotatingFileHandler(
+            LOG_FILE,
+            maxBytes=5*1024*1024,  # 5 MB
+            backupCount=1,
+            encoding='utf-8'
+        )
+
+        log_queue = queue.SimpleQueue()
+        _log_listener = QueueListener(log_queue, file_handler)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[QueueHandler(log_queue)]
+        )
     return logging.getLogger("GitToJson")
 
+# (st_mtime_ns, parsed config) — dropped when the file changes on disk
+_config_file_cache = None
+
 def load_config():
-    """Loads the repository history configuration."""
+    """Loads the repository history configuration (cached on file mtime)."""
+    global _config_file_cache
     if not os.path.exists(CONFIG_FILE):
         return {"saved_paths": []}
     try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        mtime_ns = os.stat(CONFIG_FILE).st_mtime_ns
+        if _config_file_cache is not None and _config_file_cache[0] == mtime_ns:
+            return _config_file_cache[1]
+        with open(CONFIG_FILE, 'rb') as f:
+            data = orjson.loads(f.read())
+        _config_file_cache = (mtime_ns, data)
+        return data
     except Exception:
         return {"saved_paths": []}
 
-def save_path_to_config(path):
-    """Updates the repository history configuration."""
-    config = load_config()
+# Normalized-path view of the loaded config: (config object, set of paths).
+# Rebuilt whenever load_config hands back a different object, i.e. the
+# file changed on disk, so saves never write back a stale copy.
+_saved_paths_view = (None, None)
+
+def clear_config_cache():
+    """Drops the cached config (used by tests and external edits)."""
+    global _config_file_cache, _saved_paths_view
+    _config_file_cache = None
+    _saved_paths_view = (None, None)
+
+def save_path_to_config(path, config=None):
+    """
+    Updates the repository history configuration.
+    Callers that already hold the loaded config can pass it in to skip
+    the re-read.
+    """
+    global _saved_paths_view
+    cfg = config if config is not None else load_config()
+
+    # Avoid duplicates (set membership, no rescan of the list)
+    cached_cfg, saved_set = _saved_paths_view
+    if cached_cfg is not cfg:
+        saved_set = set(cfg["saved_paths"])
+        _saved_paths_view = (cfg, saved_set)
+
     clean_path = os.path.normpath(path)
-    
-    # Avoid duplicates
-    if clean_path not in config["saved_paths"]:
-        config["saved_paths"].append(clean_path)
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4)
+    if clean_path in saved_set:
+        return
+
+    cfg["saved_paths"].append(clean_path)
+    saved_set.add(clean_path)
+    # Write to a sibling temp file and swap it in atomically, so a crash
+    # mid-write cannot leave a truncated config behind.
+    tmp_path = CONFIG_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cfg, f, indent=4)
+    os.replace(tmp_path, CONFIG_FILE)
 
 def json_serial(obj):
     """JSON serializer for objects not serializable by default json code"""
@@ -65,16 +153,37 @@ def json_serial(obj):
         return obj.isoformat()
     raise TypeError(f"Type {type(obj)} not serializable")
 
+# Directories already created this session; skips the makedirs syscall
+_ensured_dirs = set()
+
+def _ensure_dir(path):
+    """Creates a directory once per process; repeat calls are a set lookup."""
+    if path in _ensured_dirs:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
+
 def save_data_to_file(data, output_path):
     """
     Writes the extracted data list to a JSON file.
+    Uses orjson for the encode: one Rust-side pass straight to bytes.
     """
     try:
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, default=json_serial, indent=4)
+        # Ensure directory exists (dirname is empty for bare filenames)
+        dir_name = os.path.dirname(output_path)
+        if dir_name:
+            _ensure_dir(dir_name)
+
+        # Stream the array element by element: peak memory stays at one
+        # encoded item instead of the whole dump. The 1 MiB buffer batches
+        # the many small writes into few syscalls.
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.write(b'[\n')
+            for i, item in enumerate(data):
+                if i:
+                    f.write(b',\n')
+                f.write(orjson.dumps(item, default=json_serial, option=orjson.OPT_INDENT_2))
+            f.write(b'\n]')
         return True
     except Exception as e:
         logging.getLogger(__name__).error(f"Failed to save data: {e}", exc_info=True)
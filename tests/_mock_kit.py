@@ -0,0 +1,28 @@
+"""
+Shared mock toolkit for the test suite.
+
+One binding site for the unittest.mock names every test module needs,
+so individual files import from here instead of repeating the same
+from-import lists.
+"""
+from unittest.mock import ANY, Mock, MagicMock, patch, mock_open, call, DEFAULT
+
+__all__ = ["ANY", "Mock", "MagicMock", "patch", "mock_open", "call", "DEFAULT",
+           "printed_text", "async_iter"]
+
+
+async def async_iter(items):
+    """Turns a list into an async iterator, standing in for an SDK stream."""
+    for item in items:
+        yield item
+
+
+def printed_text(mock_console):
+    """
+    Joins everything printed through a mocked console into one string,
+    so tests do a single membership check instead of scanning call_args_list
+    call by call.
+    """
+    return "\n".join(
+        str(arg) for c in mock_console.print.call_args_list for arg in c.args
+    )
@@ -1,27 +1,49 @@
 import pytest
-import os
-import git
-from pathlib import Path
+import shutil
+import subprocess
+
+def pytest_configure(config):
+    # Warm up the CLI import once per worker so it sits in sys.modules
+    # before any patch target resolution or test module import runs.
+    import src.cli  # noqa: F401
+
+def _git(repo_dir, *args):
+    """Runs a git command inside repo_dir, raising on failure."""
+    subprocess.run(
+        ["git", "-C", str(repo_dir), *args],
+        check=True, capture_output=True,
+    )
+
+@pytest.fixture(scope="session")
+def _base_git_repo(tmp_path_factory):
+    """
+    Builds one template git repo for the whole session.
+    Tests get cheap copies instead of re-running git init + commit each time.
+
+    Scaffolding goes straight through the git CLI: GitPython's init/index
+    round-trip is much slower, and only the repo *path* is handed to tests,
+    so the code under test still exercises GitPython itself.
+    """
+    repo_dir = tmp_path_factory.mktemp("base") / "test_repo"
+    repo_dir.mkdir()
+
+    _git(repo_dir, "init", "-q")
+    _git(repo_dir, "config", "user.name", "Test Bot")
+    _git(repo_dir, "config", "user.email", "test@bot.com")
+
+    # Create a file and commit it (History)
+    (repo_dir / "hello.py").write_text("print('Hello World')")
+    _git(repo_dir, "add", "hello.py")
+    _git(repo_dir, "commit", "-q", "-m", "Initial commit")
+
+    return repo_dir
 
 @pytest.fixture
-def temp_git_repo(tmp_path):
+def temp_git_repo(_base_git_repo, tmp_path):
     """
     Creates a temporary git repo with some commits.
     returns the path to the repo.
     """
     repo_dir = tmp_path / "test_repo"
-    repo_dir.mkdir()
-    
-    repo = git.Repo.init(repo_dir)
-    
-    # Configure author (required for commits)
-    repo.config_writer().set_value("user", "name", "Test Bot").release()
-    repo.config_writer().set_value("user", "email", "test@bot.com").release()
-    
-    # Create a file and commit it (History)
-    file_path = repo_dir / "hello.py"
-    file_path.write_text("print('Hello World')")
-    repo.index.add([str(file_path)])
-    repo.index.commit("Initial commit")
-    
-    return repo_dir
\ No newline at end of file
+    shutil.copytree(_base_git_repo, repo_dir)
+    return repo_dir
@@ -1,98 +1,106 @@
-from unittest.mock import patch
+import pytest
+from types import SimpleNamespace
+from tests._mock_kit import ANY, Mock, MagicMock, call
+
+import src.cli as cli
 from src.cli import get_repository_path
 
-@patch('src.cli.save_path_to_config')
-@patch('src.cli.questionary')
-@patch('src.cli.load_config')
-def test_get_repository_path_select_saved(mock_load_config, mock_questionary, mock_save_config):
+@pytest.fixture(autouse=True)
+def mute_console(monkeypatch):
+    """
+    Silences the CLI's rich console for every test in this module: no
+    terminal rendering work, no interleaved output under xdist.
+    """
+    console = Mock()
+    monkeypatch.setattr(cli, "console", console)
+    return console
+
+@pytest.fixture
+def cli_mocks(monkeypatch):
+    """
+    Patches the CLI module's collaborators once via monkeypatch and hands
+    them back as one namespace, instead of stacking @patch decorators.
+    """
+    # Plain Mocks: nothing here needs magic-method support, and Mock is
+    # cheaper to construct per test than MagicMock.
+    mocks = SimpleNamespace(
+        load_config=Mock(return_value={}),
+        save_path_to_config=Mock(),
+        questionary=Mock(),
+        os=Mock(),
+    )
+    mocks.os.path.exists.return_value = True
+    mocks.os.path.isdir.return_value = True
+
+    monkeypatch.setattr(cli, "load_config", mocks.load_config)
+    monkeypatch.setattr(cli, "save_path_to_config", mocks.save_path_to_config)
+    monkeypatch.setattr(cli, "questionary", mocks.questionary)
+    monkeypatch.setattr(cli, "os", mocks.os)
+    return mocks
+
+def test_get_repository_path_select_saved(cli_mocks):
     """Test selecting a saved path."""
     # ARRANGE
-    mock_load_config.return_value = {"saved_paths": ["/path/one", "/path/two"]}
-    mock_questionary.select.return_value.ask.return_value = "/path/one"
+    cli_mocks.load_config.return_value = {"saved_paths": ["/path/one", "/path/two"]}
+    cli_mocks.questionary.select.return_value.ask.return_value = "/path/one"
 
     # ACT
     selected_path = get_repository_path()
 
     # ASSERT
     assert selected_path == "/path/one"
-    mock_questionary.select.assert_called_once()
-    mock_save_config.assert_not_called()
+    cli_mocks.questionary.select.assert_called_once()
+    cli_mocks.save_path_to_config.assert_not_called()
 
-@patch('src.cli.os')
-@patch('src.cli.save_path_to_config')
-@patch('src.cli.questionary')
-@patch('src.cli.load_config')
-def test_get_repository_path_enter_new_path_from_menu(mock_load_config, mock_questionary, mock_save_config, mock_os):
+def test_get_repository_path_enter_new_path_from_menu(cli_mocks):
     """Test entering a new path when saved paths exist."""
     # ARRANGE
-    mock_load_config.return_value = {"saved_paths": ["/path/one"]}
-    mock_questionary.select.return_value.ask.return_value = "-- Enter a New Path --"
-    mock_questionary.path.return_value.ask.return_value = "/new/path"
-    mock_os.path.exists.return_value = True
-    mock_os.path.isdir.return_value = True
-
-    # ACT
-    selected_path = get_repository_path()
-
-    # ASSERT
-    assert selected_path == "/new/path"
-    mock_questionary.select.assert_called_once()
-    mock_questionary.path.assert_called_once()
-    mock_save_config.assert_called_once_with("/new/path")
+    cli_mocks.load_config.return_value = {"saved_paths": ["/path/one"]}
+    cli_mocks.questionary.select.return_value.ask.return_value = "-- Enter a New Path --"
+    cli_mocks.questionary.path.return_value.ask.return_value = "/new/path"
 
-@patch('src.cli.os')
-@patch('src.cli.save_path_to_config')
-@patch('src.cli.questionary')
-@patch('src.cli.load_config')
-def test_get_repository_path_no_saved_paths(mock_load_config, mock_questionary, mock_save_config, mock_os):
-    """Test entering a path when no saved paths exist."""
-    # ARRANGE
-    mock_load_config.return_value = {}
-    mock_questionary.path.return_value.ask.return_value = "/new/path"
-    mock_os.path.exists.return_value = True
-    mock_os.path.isdir.return_value = True
+    # Record the prompt and save calls under one parent so the whole
+    # interaction is checked by a single ordered assert_has_calls.
+    parent = MagicMock()
+    parent.attach_mock(cli_mocks.questionary, "questionary")
+    parent.attach_mock(cli_mocks.save_path_to_config, "save_path_to_config")
 
     # ACT
     selected_path = get_repository_path()
 
     # ASSERT
     assert selected_path == "/new/path"
-    mock_questionary.select.assert_not_called()
-    mock_questionary.path.assert_called_once()
-    mock_save_config.assert_called_once_with("/new/path")
-    
-@patch('src.cli.os')
-@patch('src.cli.save_path_to_config')
-@patch('src.cli.questionary')
-@patch('src.cli.load_config')
-def test_get_repository_path_enter_new_path_with_quotes(mock_load_config, mock_questionary, mock_save_config, mock_os):
-    """Test entering a new path that has quotes and ensuring they are stripped."""
-    # ARRANGE
-    mock_load_config.return_value = {}
-    mock_questionary.path.return_value.ask.return_value = "'/new/path/quoted'"
-    mock_os.path.exists.return_value = True
-    mock_os.path.isdir.return_value = True
+    parent.assert_has_calls([
+        call.questionary.select("Select a repository:", choices=["/path/one", "-- Enter a New Path --"]),
+        call.questionary.select().ask(),
+        call.questionary.path(ANY, default=".", only_directories=True, validate=ANY),
+        call.questionary.path().ask(),
+        call.save_path_to_config("/new/path", config={"saved_paths": ["/path/one"]}),
+    ])
 
-    # ACT
-    selected_path = get_repository_path()
-
-    # ASSERT
-    assert selected_path == "/new/path/quoted"
-    mock_questionary.select.assert_not_called()
-    mock_save_config.assert_called_once_with("/new/path/quoted")
+# Case table for direct path entry: (prompt answer, expected result, saved?)
+DIRECT_ENTRY_CASES = (
+    ("/new/path", "/new/path", True),                  # plain entry
+    ("'/new/path/quoted'", "/new/path/quoted", True),  # quotes stripped
+    (None, None, False),                               # cancelled prompt
+)
 
-@patch('src.cli.save_path_to_config')
-@patch('src.cli.questionary')
-@patch('src.cli.load_config')
-def test_get_repository_path_cancel_selection(mock_load_config, mock_questionary, mock_save_config):
-    """Test cancelling the path selection."""
+@pytest.mark.parametrize("path_answer, expected, expect_save", DIRECT_ENTRY_CASES,
+                         ids=["plain", "quoted", "cancelled"])
+def test_get_repository_path_direct_entry(cli_mocks, path_answer, expected, expect_save):
+    """Table-driven: direct path entry when no saved paths exist."""
     # ARRANGE
-    mock_load_config.return_value = {}
-    mock_questionary.path.return_value.ask.return_value = None
+    cli_mocks.load_config.return_value = {}
+    cli_mocks.questionary.path.return_value.ask.return_value = path_answer
 
     # ACT
     selected_path = get_repository_path()
 
     # ASSERT
-    assert selected_path is None
-    mock_save_config.assert_not_called()
\ No newline at end of file
+    assert selected_path == expected
+    cli_mocks.questionary.select.assert_not_called()
+    cli_mocks.questionary.path.assert_called_once()
+    if expect_save:
+        cli_mocks.save_path_to_config.assert_called_once_with(expected, config={})
+    else:
+        cli_mocks.save_path_to_config.assert_not_called()
@@ -1,6 +1,11 @@
 import git
+import pytest
 from src.core import fetch_repo_data
 
+# These tests drive a real git repository (subprocess-heavy); CI runs them,
+# a fast local loop can deselect them with -m "not slow".
+pytestmark = pytest.mark.slow
+
 
 def test_fetch_history_mode(temp_git_repo):
     """Test that we can extract historical commits."""
@@ -1,11 +1,13 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from tests._mock_kit import Mock, printed_text, async_iter
 from src.engine import run_template_workflow, run_llm_execution
 
 # --- Fixtures ---
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_template():
+    # Module-scoped: the workflow only reads from it, never mutates it
     return {
         "execution": {"source": "staged"},
         "prompts": {
@@ -14,23 +16,18 @@ def sample_template():
         }
     }
 
-# --- Helper for Async Mocking ---
-
-async def mock_stream_generator(prompt):
-    """Simulates an async stream of text chunks."""
-    yield "Chunk 1"
-    yield "Chunk 2"
+@pytest.fixture
+def mock_console(mocker):
+    """Patches the engine console once; every test reads or ignores it."""
+    return mocker.patch("src.engine.console")
 
 # --- Tests for run_template_workflow ---
 
-@patch("src.engine.fetch_repo_data")
-@patch("src.engine.count_tokens")
-@patch("src.engine.console")
-def test_run_template_workflow_success(mock_console, mock_count, mock_fetch, sample_template):
+def test_run_template_workflow_success(mocker, mock_console, sample_template):
     """Test that the workflow correctly fetches data and builds the prompt."""
     # ARRANGE
-    mock_fetch.return_value = [{"diff": "print('hello')"}]
-    mock_count.return_value = 100
+    mocker.patch("src.engine.count_tokens", return_value=100)
+    mock_fetch = mocker.patch("src.engine.fetch_repo_data", return_value=[{"diff": "print('hello')"}])
     repo_path = "/tmp/repo"
 
     # ACT
@@ -42,17 +39,15 @@ def test_run_template_workflow_success(mock_console, mock_count, mock_fetch, sam
         "--- USER PROMPT ---\nUser Prompt with print('hello')"
     )
     assert result == expected_result
-    
+
     # Verify correct calls
     mock_fetch.assert_called_once_with(repo_path, {"mode": "staged"})
     mock_console.print.assert_called()  # Should print status messages
 
-@patch("src.engine.fetch_repo_data")
-@patch("src.engine.console")
-def test_run_template_workflow_no_data(mock_console, mock_fetch, sample_template):
+def test_run_template_workflow_no_data(mocker, mock_console, sample_template):
     """Test behavior when fetch_repo_data returns empty."""
     # ARRANGE
-    mock_fetch.return_value = []
+    mocker.patch("src.engine.fetch_repo_data", return_value=[])
     repo_path = "/tmp/repo"
 
     # ACT
@@ -60,25 +55,24 @@ def test_run_template_workflow_no_data(mock_console, mock_fetch, sample_template
 
     # ASSERT
     assert result is None
-    # Ensure we logged/printed a warning (checking call args roughly)
-    assert any("No data found" in str(args) for args in mock_console.print.call_args_list)
+    # Ensure we logged/printed a warning (one membership check over the
+    # joined output instead of a per-call scan)
+    printed = printed_text(mock_console)
+    assert "No data found" in printed, printed
 
 # --- Tests for run_llm_execution ---
 
-@patch("src.engine.load_settings")
-@patch("src.engine.get_provider")
-@patch("src.engine.Live")
-@patch("src.engine.console")
-def test_run_llm_execution_success(mock_console, mock_live, mock_get_provider, mock_load_settings):
+def test_run_llm_execution_success(mocker, mock_console):
     """Test the async execution wrapper."""
     # ARRANGE
-    mock_settings = MagicMock()
-    mock_load_settings.return_value = mock_settings
-    
+    mock_live = mocker.patch("src.engine.Live")
+    mock_settings = Mock()
+    mocker.patch("src.engine.load_settings", return_value=mock_settings)
+
     # Mock the provider to return our async generator
-    mock_provider = MagicMock()
-    mock_provider.stream_response = mock_stream_generator
-    mock_get_provider.return_value = mock_provider
+    mock_provider = Mock()
+    mock_provider.stream_response = lambda prompt: async_iter(["Chunk 1", "Chunk 2"])
+    mock_get_provider = mocker.patch("src.engine.get_provider", return_value=mock_provider)
 
     # ACT
     # This runs the async loop internally
@@ -89,30 +83,50 @@ def test_run_llm_execution_success(mock_console, mock_live, mock_get_provider, m
     mock_get_provider.assert_called_once_with("openai", mock_settings)
     mock_live.assert_called()  # Ensure the UI component was activated
 
-@patch("src.engine.load_settings")
-@patch("src.engine.get_provider")
-@patch("src.engine.console")
-def test_run_llm_execution_config_error(mock_console, mock_get_provider, mock_load_settings):
+def test_run_llm_execution_reuses_event_loop(mocker, mock_console):
+    """Two consecutive executions must run on the same long-lived loop,
+    or cached provider clients would hold pools bound to a closed loop."""
+    # ARRANGE
+    mocker.patch("src.engine.Live")
+    mocker.patch("src.engine.load_settings")
+
+    loops = []
+    mock_provider = Mock()
+    def fake_stream(prompt):
+        loops.append(asyncio.get_running_loop())
+        return async_iter(["Chunk"])
+    mock_provider.stream_response = fake_stream
+    mocker.patch("src.engine.get_provider", return_value=mock_provider)
+
+    # ACT
+    first = run_llm_execution("openai", "prompt")
+    second = run_llm_execution("openai", "prompt")
+
+    # ASSERT
+    assert first == second == "Chunk"
+    assert loops[0] is loops[1]
+
+def test_run_llm_execution_config_error(mocker, mock_console):
     """Test that configuration errors are caught and handled gracefully."""
     # ARRANGE
-    mock_get_provider.side_effect = ValueError("Missing API Key")
+    mocker.patch("src.engine.load_settings")
+    mocker.patch("src.engine.get_provider", side_effect=ValueError("Missing API Key"))
 
     # ACT
     result = run_llm_execution("openai", "prompt")
 
     # ASSERT
     assert result is None  # Should return None on error
-    assert any("Configuration Error" in str(args) for args in mock_console.print.call_args_list)
+    printed = printed_text(mock_console)
+    assert "Configuration Error" in printed, printed
 
-@patch("src.engine.load_settings")
-@patch("src.engine.get_provider")
-@patch("src.engine.console")
-@patch("src.engine.logger")
-def test_run_llm_execution_generic_error(mock_logger, mock_console, mock_get_provider, mock_load_settings):
+def test_run_llm_execution_generic_error(mocker, mock_console):
     """Test that generic exceptions are caught and logged."""
     # ARRANGE
+    mock_logger = mocker.patch("src.engine.logger")
+    mocker.patch("src.engine.load_settings")
     # Simulate a crash that is NOT a ValueError (e.g. Network Error)
-    mock_get_provider.side_effect = Exception("Unexpected Network Crash")
+    mocker.patch("src.engine.get_provider", side_effect=Exception("Unexpected Network Crash"))
 
     # ACT
     result = run_llm_execution("openai", "prompt")
@@ -120,4 +134,5 @@ def test_run_llm_execution_generic_error(mock_logger, mock_console, mock_get_pro
     # ASSERT
     assert result is None
     mock_logger.error.assert_called() # Verify we logged the stack trace
-    assert any("Connection Error" in str(args) for args in mock_console.print.call_args_list)
\ No newline at end of file
+    printed = printed_text(mock_console)
+    assert "Connection Error" in printed, printed
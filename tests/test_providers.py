@@ -1,72 +1,80 @@
 import pytest
 import asyncio
-from unittest.mock import patch, MagicMock
-from src.providers import get_provider, OpenAIProvider, XAIProvider, GeminiProvider, OllamaProvider
+import operator
+from types import SimpleNamespace
+from tests._mock_kit import patch, MagicMock, async_iter
+from src.providers import (
+    get_provider,
+    clear_provider_cache,
+    OpenAIProvider,
+    XAIProvider,
+    GeminiProvider,
+    OllamaProvider,
+)
 from src.config import LLMSettings
 
-# --- Helper for Async Iteration ---
-async def async_iter(items):
-    """Helper to create an async generator from a list."""
-    for item in items:
-        yield item
+@pytest.fixture(autouse=True)
+def fresh_provider_cache():
+    """Ensures each test builds providers fresh rather than from the cache."""
+    clear_provider_cache()
+    yield
+    clear_provider_cache()
+
+# --- Shared event loop ---
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """One event loop for the module: asyncio.run() would build and tear
+    down a fresh loop per test. (new_event_loop rather than asyncio.Runner,
+    which is 3.11+ while the project supports 3.10.)"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
 
 # --- Factory Tests (get_provider) ---
 
-@patch("src.providers.AsyncOpenAI")
-def test_get_provider_openai(mock_openai):
-    """Test creating OpenAI provider with valid settings."""
-    settings = LLMSettings(openai_api_key="sk-test")
-    provider = get_provider("openai", settings)
-    
-    assert isinstance(provider, OpenAIProvider)
-    # Verify client was initialized with the specific key
-    mock_openai.assert_called_with(api_key="sk-test")
-
-@patch("src.providers.AsyncOpenAI")
-def test_get_provider_xai(mock_openai):
-    """Test creating XAI provider with valid settings."""
-    settings = LLMSettings(xai_api_key="xai-test")
-    provider = get_provider("xai", settings)
-    
-    assert isinstance(provider, XAIProvider)
-    # Verify XAI specific base_url
-    mock_openai.assert_called_with(api_key="xai-test", base_url="https://api.x.ai/v1")
-
-@patch("src.providers.genai.Client")
-def test_get_provider_gemini(mock_genai):
-    """Test creating Gemini provider with valid settings."""
-    settings = LLMSettings(gemini_api_key="gemini-test")
-    provider = get_provider("gemini", settings)
-    
-    assert isinstance(provider, GeminiProvider)
-    mock_genai.assert_called_with(api_key="gemini-test")
-
-@patch("src.providers.AsyncOpenAI")
-def test_get_provider_ollama(mock_openai):
-    """Test creating Ollama provider."""
-    settings = LLMSettings(ollama_base_url="http://host:1234", ollama_model="llama3")
-    provider = get_provider("ollama", settings)
-    
-    assert isinstance(provider, OllamaProvider)
-    # Verify Ollama specific init
-    mock_openai.assert_called_with(base_url="http://host:1234", api_key="ollama")
-
-def test_get_provider_missing_keys():
+# Case table: (provider name, settings kwargs, patched SDK client, expected
+# provider class, kwargs the client must be constructed with).
+FACTORY_CASES = (
+    pytest.param("openai", {"openai_api_key": "sk-test"},
+                 "src.providers.AsyncOpenAI", OpenAIProvider,
+                 {"api_key": "sk-test"}, id="openai"),
+    pytest.param("xai", {"xai_api_key": "xai-test"},
+                 "src.providers.AsyncOpenAI", XAIProvider,
+                 {"api_key": "xai-test", "base_url": "https://api.x.ai/v1"}, id="xai"),
+    pytest.param("gemini", {"gemini_api_key": "gemini-test"},
+                 "src.providers.genai.Client", GeminiProvider,
+                 {"api_key": "gemini-test"}, id="gemini"),
+    pytest.param("ollama", {"ollama_base_url": "http://host:1234", "ollama_model": "llama3"},
+                 "src.providers.AsyncOpenAI", OllamaProvider,
+                 {"base_url": "http://host:1234", "api_key": "ollama"}, id="ollama"),
+)
+
+@pytest.mark.parametrize("name, settings_kwargs, patch_target, expected_cls, client_kwargs",
+                         FACTORY_CASES)
+def test_get_provider_factory(name, settings_kwargs, patch_target, expected_cls, client_kwargs):
+    """Table-driven: each provider name yields the right class and client init."""
+    with patch(patch_target) as mock_client:
+        provider = get_provider(name, LLMSettings(**settings_kwargs))
+
+    assert isinstance(provider, expected_cls)
+    mock_client.assert_called_with(**client_kwargs)
+
+@pytest.mark.parametrize("name, message", [
+    ("openai", "Missing OPENAI_API_KEY"),
+    ("xai", "Missing XAI_API_KEY"),
+    ("gemini", "Missing GEMINI_API_KEY"),
+])
+def test_get_provider_missing_keys(name, message):
     """Test that missing API keys raise ValueError."""
     # Use a mock object to simulate empty settings, avoiding .env file interference
     settings = MagicMock()
     settings.openai_api_key = None
     settings.xai_api_key = None
     settings.gemini_api_key = None
-    
-    with pytest.raises(ValueError, match="Missing OPENAI_API_KEY"):
-        get_provider("openai", settings)
-        
-    with pytest.raises(ValueError, match="Missing XAI_API_KEY"):
-        get_provider("xai", settings)
-        
-    with pytest.raises(ValueError, match="Missing GEMINI_API_KEY"):
-        get_provider("gemini", settings)
+
+    with pytest.raises(ValueError, match=message):
+        get_provider(name, settings)
 
 def test_get_provider_unknown():
     """Test that unknown provider names raise ValueError."""
@@ -76,58 +84,52 @@ def test_get_provider_unknown():
 
 # --- Streaming Tests (Async) ---
 
-def test_openai_stream_response():
-    """Test OpenAI streaming logic."""
-    # Mock the chunk structure returned by OpenAI SDK
-    mock_chunk = MagicMock()
-    mock_chunk.choices = [MagicMock()]
-    mock_chunk.choices[0].delta.content = "Hello AI"
-
-    with patch("src.providers.AsyncOpenAI") as MockClient:
-        mock_instance = MockClient.return_value
-        # Mock the create method to return our async iterator
-        # It must be an async function (coroutine) because the code awaits it
-        async def mock_create(*args, **kwargs):
+def make_openai_chunk(text):
+    """Builds a chunk shaped like the OpenAI SDK's streaming delta."""
+    # Plain namespaces: the provider only reads choices[0].delta.content,
+    # and attribute access stays a C-level lookup instead of MagicMock
+    # child creation on the iteration path.
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+def make_gemini_chunk(text):
+    """Builds a chunk shaped like the Google GenAI SDK's stream items."""
+    return SimpleNamespace(text=text)
+
+# Case table: (patch target, provider factory, stream method path on the
+# mocked client instance, chunk factory). XAI and Ollama reuse the OpenAI
+# SDK, so one table covers all four providers without duplicate test bodies.
+STREAM_CASES = (
+    pytest.param("src.providers.AsyncOpenAI", lambda: OpenAIProvider("key"),
+                 "chat.completions.create", make_openai_chunk, id="openai"),
+    pytest.param("src.providers.AsyncOpenAI", lambda: XAIProvider("key"),
+                 "chat.completions.create", make_openai_chunk, id="xai"),
+    pytest.param("src.providers.genai.Client", lambda: GeminiProvider("key"),
+                 "aio.models.generate_content_stream", make_gemini_chunk, id="gemini"),
+    pytest.param("src.providers.AsyncOpenAI", lambda: OllamaProvider("http://host:1234", "llama3"),
+                 "chat.completions.create", make_openai_chunk, id="ollama"),
+)
+
+@pytest.mark.parametrize("patch_target, make_provider, stream_attr, make_chunk", STREAM_CASES)
+def test_stream_response(event_loop, patch_target, make_provider, stream_attr, make_chunk):
+    """Table-driven streaming test: each provider yields the chunk text."""
+    mock_chunk = make_chunk("Hello AI")
+
+    with patch(patch_target) as MockClient:
+        # The stream method must be an async function (coroutine) because
+        # the provider awaits it before iterating.
+        async def mock_stream(*args, **kwargs):
             return async_iter([mock_chunk])
-        mock_instance.chat.completions.create.side_effect = mock_create
-        
-        provider = OpenAIProvider("key")
-        
-        # Wrapper to run async code in sync test
-        async def run():
-            chunks = []
-            async for chunk in provider.stream_response("prompt"):
-                chunks.append(chunk)
-            return chunks
-
-        result = asyncio.run(run())
-        assert result == ["Hello AI"]
+        method = operator.attrgetter(stream_attr)(MockClient.return_value)
+        method.side_effect = mock_stream
 
-def test_gemini_stream_response():
-    """Test Gemini streaming logic."""
-    # Mock the chunk structure returned by Google GenAI SDK
-    mock_chunk = MagicMock()
-    mock_chunk.text = "Hello Gemini"
+        provider = make_provider()
 
-    with patch("src.providers.genai.Client") as MockClient:
-        mock_instance = MockClient.return_value
-        # Mock the nested async method chain
-        # It must be an async function (coroutine) because the code awaits it
-        async def mock_generate(*args, **kwargs):
-            return async_iter([mock_chunk])
-        mock_instance.aio.models.generate_content_stream.side_effect = mock_generate
-        
-        provider = GeminiProvider("key")
-        
+        # Wrapper to run async code in sync test
         async def run():
             chunks = []
             async for chunk in provider.stream_response("prompt"):
                 chunks.append(chunk)
             return chunks
 
-        result = asyncio.run(run())
-        assert result == ["Hello Gemini"]
-
-# Note: XAIProvider and OllamaProvider share the exact same logic/SDK as OpenAIProvider.
-# The factory tests ensure they are initialized correctly. 
-# The OpenAI stream test covers the underlying implementation logic they share.
\ No newline at end of file
+        result = event_loop.run_until_complete(run())
+        assert result == ["Hello AI"]
\ No newline at end of file
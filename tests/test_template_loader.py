@@ -1,36 +1,59 @@
 import pytest
 import os
-from unittest.mock import patch, mock_open, MagicMock
-from src.template_loader import load_templates, validate_schema, TEMPLATE_DIR
+from tests._mock_kit import patch, mock_open
+from src.template_loader import load_templates, validate_schema, clear_template_cache, TEMPLATE_DIR
+
+# --- Fixtures ---
+
+@pytest.fixture(autouse=True)
+def fresh_template_cache():
+    """Ensures each test starts without a cached template list."""
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+# --- Helpers ---
+
+class FakeDirEntry:
+    """Plain DirEntry stand-in: cheaper than a MagicMock per file."""
+    def __init__(self, filename):
+        self.name = filename
+        self.path = os.path.join(TEMPLATE_DIR, filename)
+
+    def is_file(self, follow_symlinks=True):
+        return True
+
+def make_scandir_mock(mock_scandir, filenames):
+    """Configures an os.scandir mock to yield DirEntry-like objects."""
+    entries = [FakeDirEntry(filename) for filename in filenames]
+    mock_scandir.return_value.__enter__.return_value = iter(entries)
+    return entries
 
 # --- validate_schema tests ---
 
-def test_validate_schema_valid():
-    """Test that a correct schema passes validation."""
-    data = {
+# Case table: (template data, expected validation result)
+VALIDATE_SCHEMA_CASES = (
+    pytest.param({
         "meta": {"name": "Test Template"},
         "execution": {"source": "staged"},
         "prompts": {"system": "sys", "user": "usr"}
-    }
-    assert validate_schema(data, "test.json") is True
-
-def test_validate_schema_missing_toplevel_key():
-    """Test validation fails if a required root key is missing."""
-    data = {
+    }, True, id="valid"),
+    pytest.param({
         "meta": {"name": "Test"},
         # "execution" block is missing
         "prompts": {}
-    }
-    assert validate_schema(data, "test.json") is False
-
-def test_validate_schema_missing_meta_name():
-    """Test validation fails if meta block lacks a name."""
-    data = {
-        "meta": {}, # "name" key is missing
+    }, False, id="missing-toplevel-key"),
+    pytest.param({
+        "meta": {},  # "name" key is missing
         "execution": {},
         "prompts": {}
-    }
-    assert validate_schema(data, "test.json") is False
+    }, False, id="missing-meta-name"),
+)
+
+@pytest.mark.parametrize("data, expected", VALIDATE_SCHEMA_CASES)
+def test_validate_schema(data, expected):
+    """Table-driven: required root keys and meta.name gate validation."""
+    assert validate_schema(data, "test.json") is expected
 
 # --- load_templates tests ---
 
@@ -45,71 +68,83 @@ def test_load_templates_creates_dir_if_missing(mock_exists, mock_makedirs):
     assert templates == []
     mock_makedirs.assert_called_once_with(TEMPLATE_DIR)
 
-@patch("src.template_loader.os.listdir")
+@patch("src.template_loader.os.scandir")
 @patch("src.template_loader.os.path.exists")
-def test_load_templates_empty_dir(mock_exists, mock_listdir):
+def test_load_templates_empty_dir(mock_exists, mock_scandir):
     """Test loading from an empty directory."""
     mock_exists.return_value = True
-    mock_listdir.return_value = []
+    make_scandir_mock(mock_scandir, [])
     
     templates = load_templates()
     assert templates == []
 
-@patch("src.template_loader.json.load")
-@patch("builtins.open", new_callable=mock_open)
-@patch("src.template_loader.os.listdir")
-@patch("src.template_loader.os.path.exists")
-def test_load_templates_valid_file(mock_exists, mock_listdir, mock_file, mock_json_load):
+def test_load_templates_valid_file():
     """Test loading a valid JSON template file."""
-    mock_exists.return_value = True
-    mock_listdir.return_value = ["template1.json"]
-    
     valid_data = {
         "meta": {"name": "My Template"},
         "execution": {},
         "prompts": {}
     }
-    mock_json_load.return_value = valid_data
-    
-    templates = load_templates()
-    
+
+    # One with-block instead of a four-deep decorator stack
+    with patch("src.template_loader.os.path.exists", return_value=True), \
+         patch("src.template_loader.os.scandir") as mock_scandir, \
+         patch("builtins.open", new_callable=mock_open) as mock_file, \
+         patch("src.template_loader.orjson.loads", return_value=valid_data):
+        make_scandir_mock(mock_scandir, ["template1.json"])
+
+        templates = load_templates()
+
     assert len(templates) == 1
     assert templates[0]["meta"]["name"] == "My Template"
     assert templates[0]["_filename"] == "template1.json"
-    
+
     # Verify file open call (using os.path.join for cross-platform path separator)
     expected_path = os.path.join(TEMPLATE_DIR, "template1.json")
-    mock_file.assert_called_with(expected_path, 'r', encoding='utf-8')
+    mock_file.assert_called_with(expected_path, 'rb')
 
-@patch("src.template_loader.logger")
-@patch("src.template_loader.json.load")
-@patch("builtins.open", new_callable=mock_open)
-@patch("src.template_loader.os.listdir")
-@patch("src.template_loader.os.path.exists")
-def test_load_templates_invalid_schema(mock_exists, mock_listdir, mock_file, mock_json_load, mock_logger):
+def test_load_templates_invalid_schema():
     """Test that files with invalid schemas are skipped and logged."""
-    mock_exists.return_value = True
-    mock_listdir.return_value = ["bad_schema.json"]
-    
     # Missing 'prompts'
     invalid_data = {
         "meta": {"name": "Bad"},
         "execution": {}
     }
-    mock_json_load.return_value = invalid_data
-    
-    templates = load_templates()
-    
+
+    with patch("src.template_loader.os.path.exists", return_value=True), \
+         patch("src.template_loader.os.scandir") as mock_scandir, \
+         patch("builtins.open", new_callable=mock_open), \
+         patch("src.template_loader.orjson.loads", return_value=invalid_data), \
+         patch("src.template_loader.logger") as mock_logger:
+        make_scandir_mock(mock_scandir, ["bad_schema.json"])
+
+        templates = load_templates()
+
     assert templates == []
     mock_logger.warning.assert_called()
 
-@patch("src.template_loader.os.listdir")
+@patch("src.template_loader.os.scandir")
 @patch("src.template_loader.os.path.exists")
-def test_load_templates_ignores_non_json(mock_exists, mock_listdir):
+def test_load_templates_ignores_non_json(mock_exists, mock_scandir):
     """Test that non-JSON files are ignored."""
     mock_exists.return_value = True
-    mock_listdir.return_value = ["readme.txt", "script.py"]
+    make_scandir_mock(mock_scandir, ["readme.txt", "script.py"])
     
     templates = load_templates()
     
-    assert templates == []
\ No newline at end of file
+    assert templates == []
+
+@patch("src.template_loader.os.stat")
+@patch("src.template_loader.os.scandir")
+@patch("src.template_loader.os.path.exists")
+def test_load_templates_cached_while_mtime_unchanged(mock_exists, mock_scandir, mock_stat):
+    """Test that a second call with the same dir mtime skips the rescan."""
+    mock_exists.return_value = True
+    mock_stat.return_value.st_mtime_ns = 12345
+    make_scandir_mock(mock_scandir, [])
+
+    first = load_templates()
+    second = load_templates()
+
+    assert second is first
+    mock_scandir.assert_called_once()
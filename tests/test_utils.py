@@ -1,17 +1,44 @@
 import pytest
+import contextlib
+import io
 import json
 from datetime import datetime
-from unittest.mock import patch, mock_open, MagicMock
+from tests._mock_kit import patch, mock_open, Mock, MagicMock
 from src.utils import (
     CONFIG_FILE,
-    count_tokens, 
-    setup_logging, 
-    load_config, 
-    save_path_to_config, 
-    json_serial, 
+    _get_encoding,
+    _ensured_dirs,
+    clear_config_cache,
+    count_tokens,
+    count_tokens_batch,
+    setup_logging,
+    load_config,
+    save_path_to_config,
+    json_serial,
     save_data_to_file
 )
 
+@pytest.fixture(autouse=True)
+def fresh_encoding_cache():
+    """Clears the memoized tiktoken encoding between tests."""
+    _get_encoding.cache_clear()
+    yield
+    _get_encoding.cache_clear()
+
+@pytest.fixture(autouse=True)
+def fresh_config_cache():
+    """Clears the in-process config cache between tests."""
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+@pytest.fixture(autouse=True)
+def fresh_ensured_dirs():
+    """Clears the known-existing-directories cache between tests."""
+    _ensured_dirs.clear()
+    yield
+    _ensured_dirs.clear()
+
 # --- count_tokens ---
 
 @patch("src.utils.tiktoken")
@@ -35,29 +62,79 @@ def test_count_tokens_fallback(mock_tiktoken):
     count = count_tokens(text)
     assert count == 2
 
+# --- count_tokens_batch ---
+
+@patch("src.utils.tiktoken")
+def test_count_tokens_batch_success(mock_tiktoken):
+    """Test batch token counting with valid tiktoken response."""
+    mock_encoding = MagicMock()
+    mock_encoding.encode_batch.return_value = [[1, 2], [1, 2, 3]]
+    mock_tiktoken.encoding_for_model.return_value = mock_encoding
+
+    counts = count_tokens_batch(["ab", "abc"], model="gpt-4")
+    assert counts == [2, 3]
+    mock_encoding.encode_batch.assert_called_once()
+
+@patch("src.utils.tiktoken")
+def test_count_tokens_batch_fallback(mock_tiktoken):
+    """Test fallback logic when tiktoken fails."""
+    mock_tiktoken.encoding_for_model.side_effect = Exception("Model not found")
+
+    # Fallback logic is len(text) // 4 per entry
+    counts = count_tokens_batch(["12345678", "1234"])
+    assert counts == [2, 1]
+
 # --- setup_logging ---
 
+@patch("src.utils._log_listener", None)
 @patch("src.utils.RotatingFileHandler")
 @patch("src.utils.logging")
 def test_setup_logging(mock_logging, mock_handler):
     """Test that logging is configured correctly."""
     logger = setup_logging()
-    
+
     mock_logging.basicConfig.assert_called_once()
     mock_logging.getLogger.assert_called_with("GitToJson")
     assert logger == mock_logging.getLogger.return_value
 
+@patch("src.utils._log_listener", None)
+@patch("src.utils.RotatingFileHandler")
+@patch("src.utils.logging")
+def test_setup_logging_idempotent(mock_logging, mock_handler):
+    """Test that a second call reuses the listener instead of rebuilding."""
+    setup_logging()
+    setup_logging()
+
+    mock_handler.assert_called_once()
+    mock_logging.basicConfig.assert_called_once()
+
 # --- load_config ---
 
+@patch("src.utils.os.stat")
 @patch("src.utils.os.path.exists")
 @patch("builtins.open", new_callable=mock_open, read_data='{"saved_paths": ["/test/path"]}')
-def test_load_config_exists(mock_file, mock_exists):
+def test_load_config_exists(mock_file, mock_exists, mock_stat):
     """Test loading an existing config file."""
     mock_exists.return_value = True
-    
+    mock_stat.return_value.st_mtime_ns = 12345
+
     config = load_config()
     assert config == {"saved_paths": ["/test/path"]}
-    mock_file.assert_called_with(CONFIG_FILE, 'r', encoding='utf-8')
+    mock_file.assert_called_with(CONFIG_FILE, 'rb')
+
+@patch("src.utils.os.stat")
+@patch("src.utils.os.path.exists")
+@patch("builtins.open", new_callable=mock_open, read_data='{"saved_paths": []}')
+def test_load_config_cached_while_mtime_unchanged(mock_file, mock_exists, mock_stat):
+    """Test that a second call with the same file mtime skips the re-read."""
+    mock_exists.return_value = True
+    mock_stat.return_value.st_mtime_ns = 12345
+
+    first = load_config()
+    second = load_config()
+
+    assert second is first
+    mock_file.assert_called_once()
 
 @patch("src.utils.os.path.exists")
 def test_load_config_missing(mock_exists):
@@ -68,8 +145,8 @@ def test_load_config_missing(mock_exists):
     assert config == {"saved_paths": []}
 
 @patch("src.utils.os.path.exists")
-@patch("builtins.open", side_effect=Exception("Permission Denied"))
-def test_load_config_error(mock_file, mock_exists):
+@patch("builtins.open", new=Mock(side_effect=Exception("Permission Denied")))
+def test_load_config_error(mock_exists):
     """Test loading when file read fails."""
     mock_exists.return_value = True
     
@@ -78,17 +155,19 @@ def test_load_config_error(mock_file, mock_exists):
 
 # --- save_path_to_config ---
 
+@patch("src.utils.os.replace")
 @patch("src.utils.json.dump")
 @patch("src.utils.load_config")
 @patch("builtins.open", new_callable=mock_open)
-def test_save_path_to_config_new(mock_file, mock_load, mock_dump):
+def test_save_path_to_config_new(mock_file, mock_load, mock_dump, mock_replace):
     """Test saving a new path."""
     mock_load.return_value = {"saved_paths": ["/old/path"]}
-    
+
     save_path_to_config("/new/path")
-    
-    # Verify we opened the file for writing
-    mock_file.assert_called_with(CONFIG_FILE, 'w', encoding='utf-8')
+
+    # Verify we wrote to the temp file and swapped it in atomically
+    mock_file.assert_called_with(CONFIG_FILE + ".tmp", 'w', encoding='utf-8')
+    mock_replace.assert_called_once_with(CONFIG_FILE + ".tmp", CONFIG_FILE)
     
     # Verify json.dump was called with updated list
     args, _ = mock_dump.call_args
@@ -127,15 +206,45 @@ def test_json_serial_error():
 # --- save_data_to_file ---
 
 @patch("src.utils.os.makedirs")
-@patch("builtins.open", new_callable=mock_open)
-def test_save_data_to_file_success(mock_file, mock_makedirs):
+def test_save_data_to_file_success(mock_makedirs):
     """Test successful file saving."""
     data = [{"key": "value"}]
-    result = save_data_to_file(data, "output/data.json")
-    
+
+    # A plain BytesIO stands in for the file: no mock_open machinery,
+    # and we can check the bytes that were actually written.
+    buf = io.BytesIO()
+    opened = {}
+
+    def fake_open(path, mode="r", *args, **kwargs):
+        opened["path"], opened["mode"] = path, mode
+        return contextlib.nullcontext(buf)
+
+    with patch("builtins.open", fake_open):
+        result = save_data_to_file(data, "output/data.json")
+
     assert result is True
     mock_makedirs.assert_called_with("output", exist_ok=True)
-    mock_file.assert_called_with("output/data.json", 'w', encoding='utf-8')
+    assert opened == {"path": "output/data.json", "mode": "wb"}
+    assert json.loads(buf.getvalue()) == data
+
+@patch("src.utils.os.makedirs")
+@patch("builtins.open", new_callable=mock_open)
+def test_save_data_to_file_bare_filename(mock_file, mock_makedirs):
+    """Test that a bare filename (no directory part) skips makedirs."""
+    result = save_data_to_file([{"key": "value"}], "data.json")
+
+    assert result is True
+    mock_makedirs.assert_not_called()
+    mock_file.assert_called_with("data.json", 'wb', buffering=1 << 20)
+
+@patch("src.utils.os.makedirs")
+@patch("builtins.open", new=mock_open())
+def test_save_data_to_file_skips_known_dirs(mock_makedirs):
+    """Test that a directory is only created once per session."""
+    save_data_to_file([], "output/a.json")
+    save_data_to_file([], "output/b.json")
+
+    mock_makedirs.assert_called_once_with("output", exist_ok=True)
 
 @patch("src.utils.os.makedirs")
 def test_save_data_to_file_failure(mock_makedirs):